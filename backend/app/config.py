@@ -4,64 +4,131 @@ Handles environment switching between LOCAL and RBC deployment modes.
 """
 
 import os
-from typing import Literal
+from functools import lru_cache
+from typing import Literal, Optional
 from pathlib import Path
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 
-# Load .env file with override=True to prioritize .env over system variables
 # Find .env in the backend directory (parent of app/)
 env_path = Path(__file__).parent.parent / '.env'
 
-# Load environment variables (logging will be configured later in main.py)
-load_dotenv(dotenv_path=env_path, override=True)
+
+@lru_cache(maxsize=1)
+def _ensure_dotenv_loaded(path: str) -> None:
+    """
+    Load the given .env file once per process (logging is configured later in main.py).
+
+    The call is memoized on the resolved path, so any later call for the
+    same file returns immediately instead of re-reading and re-parsing it.
+    """
+    # override=True to prioritize .env over system variables
+    load_dotenv(dotenv_path=path, override=True)
+
+
+def _get_int(env, key: str, default: int) -> int:
+    """Read an integer setting from an environment mapping."""
+    raw = env.get(key)
+    return default if raw is None else int(raw)
+
+
+def _get_float(env, key: str, default: float) -> float:
+    """Read a float setting from an environment mapping."""
+    raw = env.get(key)
+    return default if raw is None else float(raw)
+
+
+# Values accepted as "true" for boolean settings (compared case-insensitively)
+_TRUTHY = frozenset({'1', 'true', 'yes', 'on', 'y', 't'})
+
+
+def _get_bool(env, key: str, default: bool = False) -> bool:
+    """Read a boolean setting (true/yes/on/1, any case) from an environment mapping."""
+    raw = env.get(key)
+    return default if raw is None else raw.strip().lower() in _TRUTHY
 
 
 class Config:
-    """Application configuration with environment-aware settings."""
+    """Application configuration with environment-aware settings.
+
+    Config is a process-wide singleton: constructing it again returns the
+    already-initialized instance instead of re-reading the environment.
+    """
+
+    _instance: Optional['Config'] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
 
     def __init__(self):
+        if getattr(self, '_initialized', False):
+            return
+
+        _ensure_dotenv_loaded(str(env_path.resolve()))
+
+        # Read everything from a single snapshot of the process environment
+        env = os.environ
+
         # Environment mode: 'local' or 'rbc'
-        raw_env = os.getenv('ENV', 'local')
+        raw_env = env.get('ENV', 'local')
         self.env: Literal['local', 'rbc'] = raw_env.lower().strip()
         self.is_local = self.env == 'local'
         self.is_rbc = self.env == 'rbc'
 
         # Server settings
-        self.host = os.getenv('HOST', '0.0.0.0')
-        self.port = int(os.getenv('PORT', '8000'))
-        self.debug = os.getenv('DEBUG', 'false').lower() == 'true'
+        self.host = env.get('HOST', '0.0.0.0')
+        self.port = _get_int(env, 'PORT', 8000)
+        self.debug = _get_bool(env, 'DEBUG')
 
         # CORS settings
-        self.cors_origins = os.getenv('CORS_ORIGINS', 'http://localhost:5173').split(',')
+        # Strip whitespace so entries like ' http://foo' still match the Origin header
+        raw_origins = env.get('CORS_ORIGINS', 'http://localhost:5173')
+        self.cors_origins = tuple(o.strip() for o in raw_origins.split(',') if o.strip())
+        self.cors_origins_str = ', '.join(self.cors_origins)
 
         # Database
-        self.database_url = os.getenv('DATABASE_URL', 'sqlite+aiosqlite:///./alex_assist.db')
+        self.database_url = env.get('DATABASE_URL', 'sqlite+aiosqlite:///./alex_assist.db')
+
+        # Response cache (Redis); caching is disabled when REDIS_URL is unset
+        self.redis_url = env.get('REDIS_URL') or None
+        self.cache_ttl_seconds = _get_int(env, 'CACHE_TTL_SECONDS', 3600)
 
         # File uploads
-        self.upload_dir = os.getenv('UPLOAD_DIR', './uploads')
-        self.max_upload_size_mb = int(os.getenv('MAX_UPLOAD_SIZE_MB', '10'))
+        self.upload_dir = env.get('UPLOAD_DIR', './uploads')
+        self.max_upload_size_mb = _get_int(env, 'MAX_UPLOAD_SIZE_MB', 10)
 
         # LLM Configuration - set all attributes first with defaults
         # Local environment attributes
-        self.openai_api_key = os.getenv('OPENAI_API_KEY')
-        self.openai_base_url = os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1')
+        self.openai_api_key = env.get('OPENAI_API_KEY')
+        self.openai_base_url = env.get('OPENAI_BASE_URL', 'https://api.openai.com/v1')
 
         # RBC environment attributes
-        self.rbc_llm_endpoint = os.getenv('RBC_LLM_ENDPOINT')
-        self.oauth_token_endpoint = os.getenv('OAUTH_TOKEN_ENDPOINT')
-        self.oauth_client_id = os.getenv('OAUTH_CLIENT_ID')
-        self.oauth_client_secret = os.getenv('OAUTH_CLIENT_SECRET')
-        self.oauth_scope = os.getenv('OAUTH_SCOPE') or None  # Treat empty string as None
-        self.oauth_refresh_buffer_minutes = int(os.getenv('OAUTH_REFRESH_BUFFER_MINUTES', '5'))
-        self.proxy_url = os.getenv('PROXY_URL')
-        self.proxy_username = os.getenv('PROXY_USERNAME')
-        self.proxy_password = os.getenv('PROXY_PASSWORD')
+        self.rbc_llm_endpoint = env.get('RBC_LLM_ENDPOINT')
+        self.oauth_token_endpoint = env.get('OAUTH_TOKEN_ENDPOINT')
+        self.oauth_client_id = env.get('OAUTH_CLIENT_ID')
+        self.oauth_client_secret = env.get('OAUTH_CLIENT_SECRET')
+        self.oauth_scope = env.get('OAUTH_SCOPE') or None  # Treat empty string as None
+        self.oauth_refresh_buffer_minutes = _get_int(env, 'OAUTH_REFRESH_BUFFER_MINUTES', 5)
+        self.proxy_url = env.get('PROXY_URL')
+        self.proxy_username = env.get('PROXY_USERNAME')
+        self.proxy_password = env.get('PROXY_PASSWORD')
+        self._proxy_dict = self._build_proxy_dict()
+
+        # OAuth settings are fixed after construction, so resolve this once
+        self.oauth_configured: bool = bool(
+            self.is_rbc and
+            self.oauth_token_endpoint and
+            self.oauth_client_id and
+            self.oauth_client_secret
+        )
 
         # Environment-specific validation and settings
         if self.is_local:
             # Local development: Use OpenAI directly
             self.llm_provider = 'openai'
-            self.default_model = os.getenv('DEFAULT_MODEL', 'gpt-4o-mini')
+            self.default_model = env.get('DEFAULT_MODEL', 'gpt-4o-mini')
 
             if not self.openai_api_key:
                 raise ValueError(
@@ -71,7 +138,7 @@ class Config:
         else:
             # RBC environment: Use OAuth2 + custom endpoint
             self.llm_provider = 'rbc'
-            self.default_model = os.getenv('DEFAULT_MODEL', 'gpt-4o')
+            self.default_model = env.get('DEFAULT_MODEL', 'gpt-4o')
 
             if not all([self.rbc_llm_endpoint, self.oauth_token_endpoint,
                        self.oauth_client_id, self.oauth_client_secret]):
@@ -81,44 +148,44 @@ class Config:
                 )
 
         # Model configuration
-        self.max_tokens = int(os.getenv('MAX_TOKENS', '4096'))
-        self.temperature = float(os.getenv('TEMPERATURE', '0.7'))
+        self.max_tokens = _get_int(env, 'MAX_TOKENS', 4096)
+        self.temperature = _get_float(env, 'TEMPERATURE', 0.7)
+
+        self._initialized = True
 
     def is_oauth_configured(self) -> bool:
         """Check if OAuth is configured (RBC environment only)."""
-        if not self.is_rbc:
-            return False
-        return bool(
-            self.oauth_token_endpoint and
-            self.oauth_client_id and
-            self.oauth_client_secret
-        )
+        return self.oauth_configured
 
-    def get_proxy_dict(self) -> dict | None:
-        """Get proxy configuration for requests (RBC environment only)."""
+    def _build_proxy_dict(self) -> dict | None:
+        """Build the proxy configuration for requests (RBC environment only)."""
         if not self.is_rbc or not self.proxy_url:
             return None
 
         # Ensure proxy_url has a scheme
         proxy_base = self.proxy_url
-        if not proxy_base.startswith('http://') and not proxy_base.startswith('https://'):
+        if not proxy_base.startswith(('http://', 'https://')):
             proxy_base = f'http://{proxy_base}'
 
         if self.proxy_username and self.proxy_password:
             # Parse the URL to insert auth credentials
-            from urllib.parse import urlparse
             parsed = urlparse(proxy_base)
-            proxy_with_auth = f'{parsed.scheme}://{self.proxy_username}:{self.proxy_password}@{parsed.netloc}'
-            return {
-                'http://': proxy_with_auth,
-                'https://': proxy_with_auth
-            }
+            proxy_base = f'{parsed.scheme}://{self.proxy_username}:{self.proxy_password}@{parsed.netloc}'
 
         return {
             'http://': proxy_base,
             'https://': proxy_base
         }
 
+    @property
+    def proxy_dict(self) -> dict | None:
+        """Proxy configuration for requests (RBC environment only)."""
+        return self._proxy_dict
+
+    def get_proxy_dict(self) -> dict | None:
+        """Get proxy configuration for requests (RBC environment only)."""
+        return self._proxy_dict
+
     def __repr__(self) -> str:
         """String representation (hide sensitive data)."""
         return (
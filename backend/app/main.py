@@ -3,24 +3,27 @@ Alex Assist - FastAPI Backend
 Main application entry point with environment-aware configuration.
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
+import asyncio
 import sys
 import logging
 
 from app.config import config
 from app.routers import chat, browser
+from app.services.browser_proxy import browser_proxy_service
+from app.services.web_scraper import web_scraper_service
+from app.services.cache import response_cache
+from app.utils.llm_client import llm_manager
 
 
-# Configure loguru logger
-logger.remove()  # Remove default handler
-logger.add(
-    sys.stdout,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan> | <level>{message}</level>",
-    level="DEBUG" if config.debug else "INFO",
-    colorize=True
-)
+# Path of the stdlib logging module, used to skip its frames when locating the caller
+_LOGGING_FILE = logging.__file__
+
+# Cache of stdlib level number -> loguru level (name, or number if loguru has none)
+_LEVEL_CACHE: dict[int, str | int] = {}
 
 
 # Intercept standard logging to loguru
@@ -29,56 +32,66 @@ class InterceptHandler(logging.Handler):
 
     def emit(self, record: logging.LogRecord) -> None:
         # Get corresponding Loguru level if it exists
-        try:
-            level = logger.level(record.levelname).name
-        except ValueError:
-            level = record.levelno
+        level = _LEVEL_CACHE.get(record.levelno)
+        if level is None:
+            try:
+                level = logger.level(record.levelname).name
+            except ValueError:
+                level = record.levelno
+            _LEVEL_CACHE[record.levelno] = level
 
         # Find caller from where originated the logged message
         frame, depth = sys._getframe(6), 6
-        while frame and frame.f_code.co_filename == logging.__file__:
+        while frame and frame.f_code.co_filename == _LOGGING_FILE:
             frame = frame.f_back
             depth += 1
 
         logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
 
 
-# Setup intercept handler for uvicorn loggers
-logging.getLogger("uvicorn").handlers = [InterceptHandler()]
-logging.getLogger("uvicorn.access").handlers = [InterceptHandler()]
-logging.getLogger("uvicorn.error").handlers = [InterceptHandler()]
+_logging_configured = False
+
+
+def configure_logging() -> None:
+    """
+    Configure loguru and route uvicorn's stdlib loggers through it.
 
-logger.info(f"🔧 Logger configured - Level: {'DEBUG' if config.debug else 'INFO'}")
+    This is the only place the application sets up logging; repeat calls
+    are no-ops so the sink and its format are only built once.
+    """
+    global _logging_configured
+    if _logging_configured:
+        return
 
+    level = "DEBUG" if config.debug else "INFO"
+
+    logger.remove()  # Remove default handler
+    logger.add(
+        sys.stdout,
+        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan> | <level>{message}</level>",
+        level=level,
+        colorize=True,
+        # Write from a background thread so request handlers never block on stdout
+        enqueue=True
+    )
 
-# Create FastAPI app
-app = FastAPI(
-    title="Alex Assist API",
-    description="AI Assistant backend with environment-aware LLM configuration",
-    version="0.1.0",
-    docs_url="/api/docs",
-    redoc_url="/api/redoc"
-)
+    # Setup intercept handler for uvicorn loggers
+    intercept_handler = InterceptHandler()
+    for name in ("uvicorn", "uvicorn.access", "uvicorn.error"):
+        logging.getLogger(name).handlers = [intercept_handler]
 
+    _logging_configured = True
+    logger.info(f"🔧 Logger configured - Level: {level}")
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=config.cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
+configure_logging()
 
-# Include routers
-app.include_router(chat.router)
-app.include_router(browser.router)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown."""
+    await browser_proxy_service.startup()
 
-@app.on_event("startup")
-async def startup_event():
-    """Startup event handler."""
     logger.info("")
     logger.info("=" * 80)
     logger.info("🚀 Alex Assist - AI Assistant Backend")
@@ -89,19 +102,25 @@ async def startup_event():
     logger.info(f"Default Model: {config.default_model}")
     logger.info(f"Host: {config.host}:{config.port}")
     logger.info(f"Debug Mode: {config.debug}")
-    logger.info(f"CORS Origins: {', '.join(config.cors_origins)}")
+    logger.info(f"Event Loop: {type(asyncio.get_running_loop()).__module__}")
+    logger.info(f"CORS Origins: {config.cors_origins_str}")
     logger.info("")
     logger.info("=" * 80)
     logger.info("")
 
+    yield
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Shutdown event handler."""
     logger.info("Shutting down Alex Assist backend...")
 
+    await browser_proxy_service.aclose()
+    await web_scraper_service.aclose()
+    await llm_manager.aclose()
+    await response_cache.aclose()
+
+    # Flush messages still queued for the log sink
+    await logger.complete()
+
 
-@app.get("/")
 async def root():
     """Root endpoint."""
     return {
@@ -112,7 +131,6 @@ async def root():
     }
 
 
-@app.get("/health")
 async def health():
     """Health check endpoint."""
     return {
@@ -122,6 +140,38 @@ async def health():
     }
 
 
+def create_app() -> FastAPI:
+    """Build the FastAPI application with its middleware and routes."""
+    app = FastAPI(
+        title="Alex Assist API",
+        description="AI Assistant backend with environment-aware LLM configuration",
+        version="0.1.0",
+        docs_url="/api/docs",
+        redoc_url="/api/redoc",
+        lifespan=lifespan
+    )
+
+    # Configure CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=config.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    app.add_api_route("/", root, methods=["GET"])
+    app.add_api_route("/health", health, methods=["GET"])
+
+    app.include_router(chat.router)
+    app.include_router(browser.router)
+
+    return app
+
+
+app = create_app()
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -2,11 +2,12 @@
 Browser API routes for proxy, scraping, and search functionality
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import HTMLResponse, JSONResponse, Response
+import hashlib
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response
 from pydantic import BaseModel, HttpUrl
 from typing import Optional, List
-from app.services.browser_proxy import browser_proxy_service
+from app.services.browser_proxy import browser_proxy_service, _HEADER_CHARSET_RE, _META_CHARSET_RE
 from app.services.web_scraper import web_scraper_service
 from app.services.search_service import search_service
 from loguru import logger
@@ -25,18 +26,22 @@ class SearchRequest(BaseModel):
 
 # Proxy Endpoint
 @router.get("/proxy")
-async def proxy_page(url: str = Query(..., description="The URL to proxy")):
+async def proxy_page(
+    url: str = Query(..., description="The URL to proxy"),
+    no_cache: bool = Query(False, description="Bypass cached results"),
+):
     """
     Proxy a web page to avoid CORS issues
 
     Args:
         url: The URL to fetch and proxy
+        no_cache: Skip cached copies and fetch the page again
 
     Returns:
         HTML content with rewritten URLs
     """
     try:
-        html_content, error, headers = await browser_proxy_service.fetch_page(url)
+        html_content, error, headers = await browser_proxy_service.fetch_page(url, use_cache=not no_cache)
 
         if error:
             raise HTTPException(status_code=400, detail=error)
@@ -47,24 +52,16 @@ async def proxy_page(url: str = Query(..., description="The URL to proxy")):
             "Cache-Control": "public, max-age=3600",
         }
 
-        logger.debug(f"[PROXY] Content length being sent: {len(html_content)} characters")
-        logger.debug(f"[PROXY] First 100 chars: {html_content[:100]}")
-        logger.debug(f"[PROXY] Content type: {type(html_content)}")
-
-        # Check if charset meta tag exists
-        has_meta_charset = '<meta charset=' in html_content[:1000].lower() or 'charset="utf-8"' in html_content[:1000].lower()
-        logger.debug(f"[PROXY] Has charset meta tag in HTML: {has_meta_charset}")
+        logger.debug("[PROXY] Content length being sent: {} bytes", len(html_content))
 
-        # Pass string directly to HTMLResponse - let FastAPI handle encoding
+        # The page is already UTF-8 bytes, so it is sent in one piece with a Content-Length
         # Use media_type parameter to set Content-Type (don't duplicate in headers dict)
-        response = HTMLResponse(
+        response = Response(
             content=html_content,
             headers=response_headers,
             media_type="text/html; charset=utf-8"
         )
 
-        logger.debug(f"[PROXY] Response headers after creation: {dict(response.headers)}")
-
         return response
 
     except HTTPException:
@@ -75,12 +72,13 @@ async def proxy_page(url: str = Query(..., description="The URL to proxy")):
 
 # Scrape Endpoint
 @router.post("/scrape")
-async def scrape_page(request: ScrapeRequest):
+async def scrape_page(request: ScrapeRequest, no_cache: bool = Query(False, description="Bypass cached results")):
     """
     Scrape a web page and extract its content
 
     Args:
         request: ScrapeRequest containing URL and options
+        no_cache: Skip cached results
 
     Returns:
         Scraped content with metadata
@@ -90,6 +88,7 @@ async def scrape_page(request: ScrapeRequest):
             url=request.url,
             include_links=request.include_links,
             format_markdown=request.format_markdown,
+            use_cache=not no_cache,
         )
 
         if not result.get("success"):
@@ -98,7 +97,7 @@ async def scrape_page(request: ScrapeRequest):
                 detail=result.get("error", "Failed to scrape page")
             )
 
-        return JSONResponse(content=result)
+        return result
 
     except HTTPException:
         raise
@@ -108,12 +107,13 @@ async def scrape_page(request: ScrapeRequest):
 
 # Search Endpoint
 @router.post("/search")
-async def search_web(request: SearchRequest):
+async def search_web(request: SearchRequest, no_cache: bool = Query(False, description="Bypass cached results")):
     """
     Perform a web search using DuckDuckGo
 
     Args:
         request: SearchRequest containing query and options
+        no_cache: Skip cached results
 
     Returns:
         Search results
@@ -122,6 +122,7 @@ async def search_web(request: SearchRequest):
         result = await search_service.search(
             query=request.query,
             max_results=request.max_results,
+            use_cache=not no_cache,
         )
 
         if not result.get("success"):
@@ -130,7 +131,7 @@ async def search_web(request: SearchRequest):
                 detail=result.get("error", "Search failed")
             )
 
-        return JSONResponse(content=result)
+        return result
 
     except HTTPException:
         raise
@@ -140,12 +141,13 @@ async def search_web(request: SearchRequest):
 
 # Search News Endpoint
 @router.post("/search/news")
-async def search_news(request: SearchRequest):
+async def search_news(request: SearchRequest, no_cache: bool = Query(False, description="Bypass cached results")):
     """
     Search for news articles
 
     Args:
         request: SearchRequest containing query and options
+        no_cache: Skip cached results
 
     Returns:
         News search results
@@ -154,6 +156,7 @@ async def search_news(request: SearchRequest):
         result = await search_service.search_news(
             query=request.query,
             max_results=request.max_results,
+            use_cache=not no_cache,
         )
 
         if not result.get("success"):
@@ -162,7 +165,7 @@ async def search_news(request: SearchRequest):
                 detail=result.get("error", "News search failed")
             )
 
-        return JSONResponse(content=result)
+        return result
 
     except HTTPException:
         raise
@@ -180,51 +183,42 @@ async def health_check():
 @router.get("/debug/encoding")
 async def debug_encoding(url: str = Query(..., description="URL to test encoding")):
     """Debug endpoint to see what encoding is detected for a URL"""
-    import httpx
-    from app.config import config
-
     try:
-        client_kwargs = {"timeout": 10.0, "follow_redirects": True}
-        proxy_config = config.get_proxy_dict()
-        if proxy_config:
-            client_kwargs["proxies"] = proxy_config
-
-        async with httpx.AsyncClient(**client_kwargs) as client:
-            response = await client.get(url)
-
-            content_type = response.headers.get("Content-Type", "")
-
-            # Try to detect encoding
-            encoding = None
-            if 'charset=' in content_type.lower():
-                encoding = content_type.lower().split('charset=')[-1].split(';')[0].strip()
-
-            if not encoding:
-                import re
-                head_bytes = response.content[:1024]
-                charset_match = re.search(rb'charset=["\']?([^"\'>\s]+)', head_bytes, re.IGNORECASE)
-                if charset_match:
-                    encoding = charset_match.group(1).decode('ascii')
-
-            if not encoding:
-                encoding = 'utf-8 (default)'
-
-            return {
-                "url": url,
-                "content_type": content_type,
-                "detected_encoding": encoding,
-                "httpx_encoding": response.encoding,
-                "content_length": len(response.content),
-                "first_100_chars": response.content[:100].hex()
-            }
+        # Reuse the proxy service's pooled client rather than opening a new one
+        response = await browser_proxy_service.client.get(url, timeout=10.0)
+
+        content_type = response.headers.get("Content-Type", "")
+
+        # Try to detect encoding
+        encoding = None
+        charset_match = _HEADER_CHARSET_RE.search(content_type)
+        if charset_match:
+            encoding = charset_match.group(1).lower()
+
+        # Read the body through a memoryview so the slices below don't copy it
+        content_view = memoryview(response.content)
+
+        if not encoding:
+            charset_match = _META_CHARSET_RE.search(content_view[:1024])
+            if charset_match:
+                encoding = charset_match.group(1).decode('ascii')
+
+        if not encoding:
+            encoding = 'utf-8 (default)'
+
+        return {
+            "url": url,
+            "content_type": content_type,
+            "detected_encoding": encoding,
+            "httpx_encoding": response.encoding,
+            "content_length": len(content_view),
+            "first_100_chars": content_view[:100].hex()
+        }
     except Exception as e:
         return {"error": str(e)}
 
-# Test endpoint - serves a simple UTF-8 HTML page
-@router.get("/debug/test-utf8")
-async def test_utf8():
-    """Test endpoint that returns a simple UTF-8 HTML page with special characters"""
-    test_html = """<!DOCTYPE html>
+# Static body for the UTF-8 test page, encoded once at import
+_TEST_UTF8_HTML = """<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
@@ -247,10 +241,21 @@ async def test_utf8():
     <div class="test-char">Emoji: 🌍 🚀 ✅ ❌ 🎉</div>
 </body>
 </html>"""
+_TEST_UTF8_BYTES = _TEST_UTF8_HTML.encode('utf-8')
+_TEST_UTF8_ETAG = f'"{hashlib.sha1(_TEST_UTF8_BYTES).hexdigest()}"'
 
-    return HTMLResponse(
-        content=test_html,
-        media_type="text/html; charset=utf-8"
+# Test endpoint - serves a simple UTF-8 HTML page
+@router.get("/debug/test-utf8")
+async def test_utf8(request: Request):
+    """Test endpoint that returns a simple UTF-8 HTML page with special characters"""
+    headers = {"ETag": _TEST_UTF8_ETAG}
+    if request.headers.get("if-none-match") == _TEST_UTF8_ETAG:
+        return Response(status_code=304, headers=headers)
+
+    return Response(
+        content=_TEST_UTF8_BYTES,
+        media_type="text/html; charset=utf-8",
+        headers=headers
     )
 
 # Alternative proxy endpoint using Response with explicit byte encoding
@@ -266,13 +271,11 @@ async def proxy_page_v2(url: str = Query(..., description="The URL to proxy")):
         if error:
             raise HTTPException(status_code=400, detail=error)
 
-        logger.debug(f"[PROXY-V2] Content length: {len(html_content)} characters")
-
-        # Explicitly encode to UTF-8 bytes
-        content_bytes = html_content.encode('utf-8')
+        # The proxy service already returns UTF-8 bytes
+        content_bytes = html_content
 
-        logger.debug(f"[PROXY-V2] Encoded to {len(content_bytes)} bytes")
-        logger.debug(f"[PROXY-V2] First 50 bytes hex: {content_bytes[:50].hex()}")
+        logger.debug("[PROXY-V2] Content length: {} bytes", len(content_bytes))
+        logger.opt(lazy=True).debug("[PROXY-V2] First 50 bytes hex: {}", lambda: content_bytes[:50].hex())
 
         # Use Response directly with bytes and explicit headers
         return Response(
@@ -5,13 +5,24 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Literal
 from loguru import logger
-import json
+import orjson
 
 from app.utils.llm_client import llm_manager
 
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
+# SSE framing, pre-encoded so each event is built directly as bytes
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+_SSE_DONE = b'data: {"done":true}\n\n'
+
+# Model name prefixes of reasoning models (GPT-5, o1, o3), checked in a single startswith call
+_REASONING_PREFIXES = ('gpt-5', 'o1', 'o3')
+
+# Headers that stop intermediate proxies from caching or buffering the event stream
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
 
 class Message(BaseModel):
     """Chat message model."""
@@ -54,12 +65,13 @@ async def chat_completions(request: ChatRequest):
         model = request.model or llm_manager.get_default_model()
 
         # Check if this is a reasoning model (GPT-5, o1, o3)
-        is_reasoning_model = model.startswith('gpt-5') or model.startswith('o1') or model.startswith('o3')
+        is_reasoning_model = model.startswith(_REASONING_PREFIXES)
 
         # Prepare base parameters
         params = {
             'model': model,
-            'messages': [msg.dict() for msg in request.messages],
+            # Dump all messages in one pass instead of calling .dict() on each one
+            'messages': request.model_dump(include={'messages'})['messages'],
             'stream': request.stream
         }
 
@@ -81,7 +93,8 @@ async def chat_completions(request: ChatRequest):
             # Streaming response
             return StreamingResponse(
                 stream_chat_response(client, params),
-                media_type="text/event-stream"
+                media_type="text/event-stream",
+                headers=_SSE_HEADERS
             )
         else:
             # Non-streaming response
@@ -118,7 +131,7 @@ async def stream_chat_response(client, params):
         params: Request parameters
 
     Yields:
-        SSE formatted chunks
+        SSE formatted chunks, as UTF-8 bytes
     """
     try:
         stream = await client.chat.completions.create(**params)
@@ -129,24 +142,24 @@ async def stream_chat_response(client, params):
                 logger.debug(f"Skipping chunk with no choices (metadata chunk)")
                 continue
 
-            if chunk.choices[0].delta.content is not None:
-                content = chunk.choices[0].delta.content
-
-                # Format as SSE event
-                data = {
-                    "content": content,
-                    "finish_reason": chunk.choices[0].finish_reason
-                }
+            choice = chunk.choices[0]
+            content = choice.delta.content
+            if content is not None:
+                # Format as SSE event; finish_reason is only sent once the model sets it
+                if choice.finish_reason is None:
+                    data = {"content": content}
+                else:
+                    data = {"content": content, "finish_reason": choice.finish_reason}
 
-                yield f"data: {json.dumps(data)}\n\n"
+                yield _SSE_PREFIX + orjson.dumps(data) + _SSE_SUFFIX
 
         # Send done signal
-        yield f"data: {json.dumps({'done': True})}\n\n"
+        yield _SSE_DONE
 
     except Exception as e:
         logger.error(f"Stream error: {e}")
         error_data = {"error": str(e)}
-        yield f"data: {json.dumps(error_data)}\n\n"
+        yield _SSE_PREFIX + orjson.dumps(error_data) + _SSE_SUFFIX
 
 
 @router.get("/models")
@@ -2,12 +2,233 @@
 Browser proxy service for handling CORS and serving web pages through iframe
 """
 
+import asyncio
+import codecs
+import hashlib
+import ipaddress
+import multiprocessing
+import os
+import re
+import socket
+import ssl
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import httpx
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlsplit
 from typing import Optional
 from loguru import logger
 from app.config import config
+from app.services.cache import response_cache
+from app.utils.html_rewrite import rewrite_html
+from app.utils.single_flight import SingleFlight
+from app.utils.ttl_cache import TTLCache
+
+# charset-normalizer is optional - without it undeclared encodings fall back to UTF-8
+try:
+    from charset_normalizer import from_bytes as detect_charset
+except ImportError:
+    detect_charset = None
+
+# httpx only decodes Brotli when brotli (or brotlicffi) is installed, so "br" is only advertised then
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        _ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        _ACCEPT_ENCODING = "gzip, deflate"
+
+# HTTP/2 needs the h2 package (the httpx[http2] extra); without it the client stays on HTTP/1.1
+try:
+    import h2  # noqa: F401
+    _HTTP2_SUPPORTED = True
+except ImportError:
+    _HTTP2_SUPPORTED = False
+
+# How long a proxied page is reused; matches the Cache-Control max-age the proxy endpoint advertises
+PAGE_CACHE_TTL_SECONDS = 3600
+PAGE_CACHE_MAX_ENTRIES = 256
+
+# Total page-body bytes each page cache may hold; pages can be up to MAX_PAGE_BYTES each,
+# so the entry count alone doesn't bound memory
+PAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+REWRITE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# max-age directive of a Cache-Control header
+_MAX_AGE_RE = re.compile(r'(?:^|[,\s])max-age\s*=\s*"?(\d+)', re.IGNORECASE)
+
+# Cache-Control directives that keep a page out of the page caches (no-cache pages are revalidated instead)
+_UNCACHEABLE_DIRECTIVES = frozenset({'no-store', 'no-cache', 'private'})
+# Responses the proxy must not keep at all, not even as a copy to revalidate later
+_UNSTORABLE_DIRECTIVES = frozenset({'no-store', 'private'})
+
+# Rewrites memoized by body digest, for pages refetched with identical content
+REWRITE_CACHE_MAX_ENTRIES = 128
+REWRITE_CACHE_TTL_SECONDS = 600
+
+# How long a page's ETag/Last-Modified is kept for conditional revalidation
+VALIDATED_PAGE_TTL_SECONDS = 24 * 3600
+
+# Upstream connection pool; idle connections are kept warm so repeat fetches skip the handshakes
+MAX_CONNECTIONS = 500
+MAX_KEEPALIVE_CONNECTIONS = 100
+KEEPALIVE_EXPIRY_SECONDS = 30.0
+
+# Worker processes used to parse and rewrite pages off the event loop
+PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Workers start from a clean interpreter rather than a fork of a process that already
+# runs the log writer thread and holds open HTTP/Redis connections (forkserver isn't on Windows)
+_PARSE_POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# Largest (decompressed) page body the proxy will download
+MAX_PAGE_BYTES = 10 * 1024 * 1024
+
+# Redirect hops followed for one page; each hop is SSRF-checked like the original URL
+MAX_REDIRECTS = 10
+
+# Size of each chunk read from the upstream response body
+_READ_CHUNK_SIZE = 64 * 1024
+
+# charset parameter of a Content-Type header
+_HEADER_CHARSET_RE = re.compile(r'charset=["\']?([^"\';\s]+)', re.IGNORECASE)
+
+# charset declaration inside <meta> tags, matched against raw response bytes
+_META_CHARSET_RE = re.compile(rb'charset=["\']?([^"\'>\s]+)', re.IGNORECASE)
+
+# Byte order marks and the encodings they identify (UTF-32 before UTF-16, which shares a prefix)
+_BOMS = (
+    (b'\xef\xbb\xbf', 'utf-8-sig'),
+    (b'\xff\xfe\x00\x00', 'utf-32'),
+    (b'\x00\x00\xfe\xff', 'utf-32'),
+    (b'\xff\xfe', 'utf-16'),
+    (b'\xfe\xff', 'utf-16'),
+)
+
+# Codec names (as normalized by codecs.lookup) whose bytes are served without transcoding
+_UTF8_CODECS = frozenset({'utf-8', 'utf-8-sig', 'ascii'})
+
+# Bytes of an undeclared page sampled for encoding detection
+DETECT_SAMPLE_BYTES = 4096
+
+# Declared encodings that servers often send by default, so they are double-checked
+_UNTRUSTED_ENCODINGS = frozenset({'iso-8859-1', 'ascii'})
+
+# Response headers removed for iframe compatibility and proper content display
+_UNSAFE_HEADERS = frozenset({
+    'x-frame-options',
+    'content-security-policy',
+    'x-content-security-policy',
+    'x-webkit-csp',
+    # HSTS applies to the upstream origin, not to the proxied copy
+    'strict-transport-security',
+    # Strip content-encoding headers as httpx has already decompressed the content
+    # If we leave these, the browser will try to decompress already-decompressed content
+    'content-encoding',
+    'transfer-encoding',
+    # Also strip content-length as it may be incorrect after our modifications
+    'content-length',
+})
+
+# Characters that must be percent-encoded in a URL (RFC 3986) and could break out of an HTML attribute
+_INVALID_URL_CHARS_RE = re.compile(r'["<>`\s\x00-\x1f\x7f]')
+
+# Hosts that always resolve to the local machine
+_BLOCKED_HOSTS = frozenset({'localhost', '127.0.0.1', '0.0.0.0', '::1'})
+
+# How long the SSRF verdict for a resolved hostname is reused
+HOST_CHECK_TTL_SECONDS = 60
+
+# TLS context shared by every upstream connection; building one loads the whole CA bundle
+_ssl_context: Optional[ssl.SSLContext] = None
+
+
+def _get_ssl_context() -> ssl.SSLContext:
+    """Return the process-wide TLS context, creating it on first use"""
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = httpx.create_ssl_context()
+    return _ssl_context
+
+
+class PageTooLargeError(Exception):
+    """Raised when an upstream page body exceeds MAX_PAGE_BYTES"""
+
+
+class RedirectBlockedError(Exception):
+    """Raised when an upstream redirect points somewhere the proxy must not fetch"""
+
+
+def _conditional_headers(response_headers: httpx.Headers) -> dict:
+    """Build If-None-Match / If-Modified-Since request headers from a response's validators"""
+    conditional = {}
+    if etag := response_headers.get("ETag"):
+        conditional["If-None-Match"] = etag
+    if last_modified := response_headers.get("Last-Modified"):
+        conditional["If-Modified-Since"] = last_modified
+    return conditional
+
+
+def _best_encoding(sample: bytes) -> Optional[str]:
+    """Return charset-normalizer's best non-ASCII guess for sample, or None if it is inconclusive"""
+    matches = detect_charset(sample)
+    best = matches.best()
+    if best is None:
+        return None
+    try:
+        if codecs.lookup(best.encoding).name == 'ascii':
+            return None
+    except LookupError:
+        return None
+
+    # Short Latin text often scores the same under several code pages; break ties the way
+    # browsers do for undeclared pages, in favour of windows-1252
+    for match in matches:
+        if match.chaos == best.chaos and match.coherence == best.coherence \
+                and 'cp1252' in match.could_be_from_charset:
+            return 'cp1252'
+    return best.encoding
+
+
+def _cache_directives(response_headers: httpx.Headers) -> set[str]:
+    """Return the lower-cased directive names from a response's Cache-Control header"""
+    cache_control = response_headers.get("Cache-Control", "")
+    return {directive.split("=", 1)[0].strip().lower() for directive in cache_control.split(",")}
+
+
+def _page_ttl(response_headers: httpx.Headers) -> int:
+    """Return how many seconds a page may be served from cache, per its Cache-Control and Expires headers"""
+    cache_control = response_headers.get("Cache-Control")
+    if cache_control:
+        if _cache_directives(response_headers) & _UNCACHEABLE_DIRECTIVES:
+            return 0
+        if max_age := _MAX_AGE_RE.search(cache_control):
+            return min(int(max_age.group(1)), PAGE_CACHE_TTL_SECONDS)
+
+    expires = response_headers.get("Expires")
+    if expires:
+        try:
+            expires_at = parsedate_to_datetime(expires)
+        except (TypeError, ValueError):
+            # An invalid Expires value means the response is already stale
+            return 0
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+        return max(0, min(int(remaining), PAGE_CACHE_TTL_SECONDS))
+
+    return PAGE_CACHE_TTL_SECONDS
+
+
+def _is_internal_ip(ip: ipaddress.IPv4Address | ipaddress.IPv6Address) -> bool:
+    """Return True for loopback, private, link-local (incl. cloud metadata) and other non-public addresses"""
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return not ip.is_global or ip.is_multicast
 
 class BrowserProxyService:
     """
@@ -21,9 +242,8 @@ class BrowserProxyService:
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br",
+            "Accept-Encoding": _ACCEPT_ENCODING,
             "DNT": "1",
-            "Connection": "keep-alive",
             "Upgrade-Insecure-Requests": "1",
         }
 
@@ -40,134 +260,208 @@ class BrowserProxyService:
                 logger.error(f"Failed to setup rbc_security for browser proxy: {e}")
 
         # Get proxy configuration from config (for RBC environment)
-        self.proxy_config = config.get_proxy_dict()
+        self.proxy_config = config.proxy_dict
+
+        # Rewritten pages keyed by URL, so repeat requests skip the upstream fetch
+        self._page_cache = TTLCache(
+            maxsize=PAGE_CACHE_MAX_ENTRIES, ttl=PAGE_CACHE_TTL_SECONDS,
+            maxbytes=PAGE_CACHE_MAX_BYTES, sizeof=lambda result: len(result[0]),
+        )
+
+        # (conditional request headers, rewritten page) for pages that sent an ETag or
+        # Last-Modified, kept past the page cache TTL so expired pages can be revalidated
+        self._validated_pages = TTLCache(
+            maxsize=PAGE_CACHE_MAX_ENTRIES, ttl=VALIDATED_PAGE_TTL_SECONDS,
+            maxbytes=PAGE_CACHE_MAX_BYTES, sizeof=lambda entry: len(entry[1][0]),
+        )
+
+        # Rewritten HTML keyed by (body digest, content type, URL)
+        self._rewrite_cache = TTLCache(
+            maxsize=REWRITE_CACHE_MAX_ENTRIES, ttl=REWRITE_CACHE_TTL_SECONDS,
+            maxbytes=REWRITE_CACHE_MAX_BYTES, sizeof=len,
+        )
+
+        # Detected encodings of undeclared pages, keyed by host
+        self._host_encodings = TTLCache(maxsize=512, ttl=PAGE_CACHE_TTL_SECONDS)
+
+        # SSRF verdicts for recently resolved hostnames
+        self._host_cache = TTLCache(maxsize=1024, ttl=HOST_CHECK_TTL_SECONDS)
+
+        # Upstream fetches currently in progress, keyed by URL
+        self._inflight = SingleFlight()
+
+        # Shared HTTP client, created in startup() (or on first use) and closed in aclose()
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Process pool for HTML rewriting, created in startup() and shut down in aclose()
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared upstream HTTP client, created on first use if startup() hasn't run"""
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """
+        Build the pooled HTTP client used for all upstream fetches
 
-    async def fetch_page(self, url: str) -> tuple[Optional[str], Optional[str], Optional[dict]]:
+        Reusing one client keeps connections alive between requests, so repeat
+        fetches to the same host skip the TCP and TLS handshakes
+        """
+        if self.proxy_config:
+            logger.info("Using proxy configuration for browser proxy requests")
+
+        if not _HTTP2_SUPPORTED:
+            logger.warning("h2 not installed - browser proxy falling back to HTTP/1.1")
+
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            follow_redirects=True,
+            proxies=self.proxy_config,
+            headers=self.headers,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            # Requests to the same host multiplex over one connection; servers without
+            # HTTP/2 (and HTTP proxies) negotiate HTTP/1.1 via ALPN
+            http2=_HTTP2_SUPPORTED,
+            verify=_get_ssl_context(),
+        )
+
+    def _create_parse_pool(self) -> ProcessPoolExecutor:
+        """Build the worker pool used to rewrite pages off the event loop"""
+        return ProcessPoolExecutor(
+            max_workers=PARSE_WORKERS,
+            mp_context=multiprocessing.get_context(_PARSE_POOL_START_METHOD),
+        )
+
+    async def startup(self) -> None:
+        """Create the shared HTTP client and the HTML parse pool"""
+        if self._parse_pool is None:
+            self._parse_pool = self._create_parse_pool()
+
+        if self._client is None:
+            self._client = self._create_client()
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and shut down the parse pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
+            self._parse_pool = None
+
+    async def fetch_page(self, url: str, use_cache: bool = True) -> tuple[Optional[bytes], Optional[str], Optional[dict]]:
         """
-        Fetch a web page and return its content, rewritten for iframe display
+        Fetch a web page and return its content as UTF-8 bytes, rewritten for iframe display
 
         Args:
             url: The URL to fetch
+            use_cache: Whether a cached copy of the page may be returned
 
         Returns:
             Tuple of (html_content, error_message, headers)
         """
-        try:
-            # Validate URL
-            if not self._is_valid_url(url):
-                return None, "Invalid URL provided", None
-
-            # Check for SSRF protection
-            if self._is_internal_url(url):
-                return None, "Access to internal URLs is not allowed", None
-
-            # Fetch the page with proxy support (for RBC environment)
-            client_kwargs = {
-                "timeout": self.timeout,
-                "follow_redirects": True,
-            }
-            if self.proxy_config:
-                client_kwargs["proxies"] = self.proxy_config
-                logger.info(f"Using proxy configuration for request to {url}")
-
-            async with httpx.AsyncClient(**client_kwargs) as client:
-                response = await client.get(url, headers=self.headers)
-                response.raise_for_status()
-
-                # Only process HTML content
-                content_type = response.headers.get("Content-Type", "")
-                if "text/html" not in content_type:
-                    return None, f"Non-HTML content type: {content_type}", None
-
-                # Log ALL response headers for debugging
-                logger.debug("=" * 80)
-                logger.debug(f"[PROXY DEBUG] URL: {url}")
-                logger.debug(f"[PROXY DEBUG] Response Headers:")
-                for key, value in response.headers.items():
-                    logger.debug(f"  {key}: {value}")
-                logger.debug(f"[PROXY DEBUG] Content length: {len(response.content)} bytes")
-                logger.debug(f"[PROXY DEBUG] First 50 bytes (hex): {response.content[:50].hex()}")
-
-                # Better encoding detection with multiple fallbacks
-                import re
-
-                # Try to import chardet, but don't fail if not available
-                try:
-                    import chardet
-                    has_chardet = True
-                except ImportError:
-                    has_chardet = False
-                    logger.warning("chardet not installed, encoding detection may be less accurate")
-
-                # httpx automatically decompresses gzip, deflate, and brotli
-                # We don't need to manually decompress - response.content is already decompressed
-                response_content = response.content
-
-                logger.debug(f"[PROXY DEBUG] Content length: {len(response_content)} bytes")
-                logger.debug(f"[PROXY DEBUG] First 50 bytes (hex): {response_content[:50].hex()}")
-
-                # 1. Try to get charset from Content-Type header
-                encoding = None
-                if 'charset=' in content_type.lower():
-                    try:
-                        encoding = content_type.lower().split('charset=')[-1].split(';')[0].strip()
-                        logger.debug(f"[PROXY DEBUG] Encoding from Content-Type: {encoding}")
-                    except:
-                        pass
-
-                # 2. Try to detect from HTML meta tags
-                if not encoding or encoding.lower() in ['iso-8859-1', 'ascii']:
-                    # Look for charset in first 2048 bytes with UTF-8 attempt first
-                    head_bytes = response_content[:2048]
-                    # Try UTF-8 first to see if meta charset says UTF-8
-                    try:
-                        head_str = head_bytes.decode('utf-8', errors='ignore')
-                        charset_match = re.search(r'charset=["\']?([^"\'>\s]+)', head_str, re.IGNORECASE)
-                        if charset_match:
-                            meta_encoding = charset_match.group(1).lower()
-                            logger.debug(f"[PROXY DEBUG] Encoding from HTML meta: {meta_encoding}")
-                            if meta_encoding == 'utf-8':
-                                encoding = 'utf-8'
-                    except:
-                        pass
-
-                # 3. Use chardet to detect encoding if we don't trust the header
-                if has_chardet and (not encoding or encoding.lower() in ['iso-8859-1', 'ascii']):
-                    try:
-                        detected = chardet.detect(response_content[:10000])
-                        if detected and detected.get('confidence', 0) > 0.7:
-                            encoding = detected['encoding']
-                            logger.debug(f"[PROXY DEBUG] Encoding from chardet: {encoding} (confidence: {detected.get('confidence')})")
-                    except Exception as e:
-                        logger.debug(f"[PROXY DEBUG] chardet detection failed: {e}")
-
-                # 4. Fallback to utf-8 if nothing detected or low confidence
-                if not encoding:
-                    encoding = 'utf-8'
-
-                logger.debug(f"[PROXY DEBUG] Final encoding to use: {encoding}")
-                logger.debug("=" * 80)
-                logger.info(f"Detected encoding: {encoding} for {url}")
-
-                # Decode with detected encoding
-                try:
-                    html_content = response_content.decode(encoding, errors='replace')
-                    logger.debug(f"[PROXY DEBUG] Successfully decoded with {encoding}")
-                    logger.debug(f"[PROXY DEBUG] First 200 chars of decoded HTML: {html_content[:200]}")
-                except Exception as e:
-                    logger.debug(f"[PROXY DEBUG] Decode with {encoding} failed: {e}, trying UTF-8")
-                    # Last resort: force utf-8 with error replacement
-                    html_content = response_content.decode('utf-8', errors='replace')
-                    logger.debug(f"[PROXY DEBUG] First 200 chars of decoded HTML (UTF-8): {html_content[:200]}")
-
-                # Rewrite URLs in the HTML to route through proxy
-                rewritten_html = self._rewrite_urls(html_content, url)
+        cache_key = response_cache.make_key("proxy", url)
+
+        # Serve repeat requests for the same page from the cache
+        if use_cache:
+            cached = self._page_cache.get(url)
+            if cached is not None:
+                logger.debug("Page cache hit for {}", url)
+                return cached
+
+            shared = await response_cache.get_blob(cache_key)
+            if shared is not None:
+                logger.debug("Shared cache hit for {}", url)
+                html_content, safe_headers = shared
+                result = (html_content, None, safe_headers)
+                self._page_cache.set(url, result)
+                return result
+
+        # Concurrent requests for the same page share one upstream fetch
+        return await self._inflight.do(url, lambda: self._load_page(url, cache_key, revalidate=use_cache))
+
+    async def _load_page(
+        self, url: str, cache_key: str, revalidate: bool = True
+    ) -> tuple[Optional[bytes], Optional[str], Optional[dict]]:
+        """
+        Fetch a page from upstream, rewrite it and store it in the caches
 
-                # Prepare safe headers for iframe
-                safe_headers = self._get_safe_headers(response.headers)
+        Args:
+            url: The URL to fetch
+            cache_key: Shared cache key for the page
+            revalidate: Whether an earlier copy may be revalidated with a conditional request
 
-                return rewritten_html, None, safe_headers
+        Returns:
+            Tuple of (html_content, error_message, headers)
+        """
+        try:
+            # Validate URL and check for SSRF protection
+            error = await self._validate_url(url)
+            if error:
+                return None, error, None
+
+            # Ask upstream whether an earlier copy is still current instead of downloading it again
+            stale = self._validated_pages.get(url) if revalidate else None
+            conditional_headers, stale_result = stale or (None, None)
+
+            status_code, content_type, response_content, response_headers = await self._fetch_raw(
+                url, conditional_headers
+            )
+
+            if status_code == 304 and stale_result is not None:
+                logger.debug("Not modified upstream, reusing rewritten page for {}", url)
+                await self._store_page(url, cache_key, stale_result, _page_ttl(response_headers))
+                return stale_result
+
+            # Only process HTML content
+            if "text/html" not in content_type:
+                return None, f"Non-HTML content type: {content_type}", None
+
+            # Log ALL response headers for debugging (only built when DEBUG is enabled)
+            logger.opt(lazy=True).debug(
+                "[PROXY DEBUG] Response headers for {}: {}", lambda: url, lambda: dict(response_headers)
+            )
+
+            # Identical bodies (refreshes, no_cache reloads, pages without validators)
+            # reuse the earlier rewrite instead of decoding and rewriting again
+            rewrite_key = (hashlib.blake2b(response_content, digest_size=16).digest(), content_type, url)
+            rewritten_html = self._rewrite_cache.get(rewrite_key)
+            if rewritten_html is None:
+                html_content = self._to_utf8(response_content, content_type, url)
 
+                # Rewrite URLs in the HTML to route through proxy
+                rewritten_html = await self._rewrite_urls(html_content, url)
+                if rewritten_html is None:
+                    # Serve the page as-is this once, but never cache an unrewritten copy
+                    return html_content, None, self._get_safe_headers(response_headers)
+                self._rewrite_cache.set(rewrite_key, rewritten_html)
+
+            # Prepare safe headers for iframe
+            safe_headers = self._get_safe_headers(response_headers)
+
+            # Cache the final rewritten page so hits skip both the fetch and the rewrite,
+            # for as long as upstream allows
+            result = (rewritten_html, None, safe_headers)
+            await self._store_page(url, cache_key, result, _page_ttl(response_headers))
+
+            # Keep the page's validators so it can be revalidated once the cached copy expires
+            validators = _conditional_headers(response_headers)
+            if validators and not _cache_directives(response_headers) & _UNSTORABLE_DIRECTIVES:
+                self._validated_pages.set(url, (validators, result))
+
+            return result
+
+        except (PageTooLargeError, RedirectBlockedError) as e:
+            logger.warning(f"Refusing to proxy {url}: {e}")
+            return None, str(e), None
         except httpx.TimeoutException:
             logger.error(f"Timeout fetching URL: {url}")
             return None, "Request timed out", None
@@ -178,68 +472,255 @@ class BrowserProxyService:
             logger.error(f"Error fetching URL {url}: {str(e)}")
             return None, f"Error fetching page: {str(e)}", None
 
-    def _rewrite_urls(self, html: str, base_url: str) -> str:
+    async def _store_page(self, url: str, cache_key: str, result: tuple, ttl: int) -> None:
+        """
+        Store a rewritten page in the in-process and shared caches
+
+        Args:
+            url: The page URL
+            cache_key: Shared cache key for the page
+            result: Tuple of (html_content, error_message, headers)
+            ttl: Seconds the page may be served from cache; 0 skips caching
+        """
+        if ttl <= 0:
+            return
+
+        self._page_cache.set(url, result, ttl=ttl)
+        if response_cache.enabled:
+            html_content, _, safe_headers = result
+            await response_cache.set_blob(cache_key, html_content, safe_headers, ttl=ttl)
+
+    async def _fetch_raw(
+        self, url: str, conditional_headers: Optional[dict] = None
+    ) -> tuple[int, str, bytes, httpx.Headers]:
+        """
+        Fetch a URL over the shared client and return its raw parts
+
+        This is the only method that talks to the HTTP library; encoding
+        detection and URL rewriting work purely on the content type and bytes
+
+        Args:
+            url: The URL to fetch
+            conditional_headers: If-None-Match / If-Modified-Since headers for revalidation
+
+        Returns:
+            Tuple of (status_code, content_type, body, response_headers); the body is
+            empty for 304 and non-HTML responses
+        """
+        # Proxy support (for RBC environment) is configured on the shared client
+        for _ in range(MAX_REDIRECTS + 1):
+            # Stream the response so the headers can be checked before the body is downloaded
+            async with self.client.stream(
+                "GET", url, headers=conditional_headers, follow_redirects=False
+            ) as response:
+                if response.next_request is None:
+                    return await self._read_response(response, conditional_headers)
+                url = str(response.next_request.url)
+
+            # Redirects are followed by hand so a public page can't bounce the proxy
+            # to an internal address
+            error = await self._validate_url(url)
+            if error:
+                raise RedirectBlockedError(f"Redirect to {url} blocked: {error}")
+
+        raise RedirectBlockedError(f"Too many redirects (over {MAX_REDIRECTS})")
+
+    async def _read_response(
+        self, response: httpx.Response, conditional_headers: Optional[dict]
+    ) -> tuple[int, str, bytes, httpx.Headers]:
+        """
+        Check a streamed (non-redirect) response and read its body within MAX_PAGE_BYTES
+
+        Args:
+            response: The open streamed response
+            conditional_headers: The conditional headers the request was sent with
+
+        Returns:
+            Tuple of (status_code, content_type, body, response_headers); the body is
+            empty for 304 and non-HTML responses
+        """
+        content_type = response.headers.get("Content-Type", "")
+
+        # Not modified - the caller already has the page
+        if response.status_code == 304 and conditional_headers:
+            return response.status_code, content_type, b"", response.headers
+
+        response.raise_for_status()
+
+        # Non-HTML content is rejected by the caller - don't download it
+        if "text/html" not in content_type:
+            return response.status_code, content_type, b"", response.headers
+
+        # Refuse pages that announce a size over the limit before reading them
+        content_length = response.headers.get("Content-Length", "")
+        if content_length.isdigit() and int(content_length) > MAX_PAGE_BYTES:
+            raise PageTooLargeError(f"Page too large: {content_length} bytes")
+
+        # httpx automatically decompresses gzip and deflate (and brotli, when installed)
+        # We don't need to manually decompress - the chunks are already decompressed
+        chunks = []
+        received = 0
+        async for chunk in response.aiter_bytes(_READ_CHUNK_SIZE):
+            received += len(chunk)
+            # Content-Length may be missing or describe the compressed body, so count as we go
+            if received > MAX_PAGE_BYTES:
+                raise PageTooLargeError(f"Page too large: over {MAX_PAGE_BYTES} bytes")
+            chunks.append(chunk)
+
+        return response.status_code, content_type, b"".join(chunks), response.headers
+
+    def _to_utf8(self, response_content: bytes, content_type: str, url: str) -> bytes:
+        """
+        Detect the character encoding of an HTML body and return the body as UTF-8
+
+        UTF-8 pages - the vast majority - are returned as-is, without a decode/encode round trip
+
+        Args:
+            response_content: The raw (already decompressed) response body
+            content_type: The Content-Type response header
+            url: The page URL (for logging)
+
+        Returns:
+            The HTML as UTF-8 bytes
+        """
+        logger.opt(lazy=True).debug(
+            "[PROXY DEBUG] Content length: {} bytes, first 50 bytes (hex): {}",
+            lambda: len(response_content), lambda: response_content[:50].hex()
+        )
+
+        encoding = None
+
+        # 1. A byte order mark is authoritative
+        for bom, bom_encoding in _BOMS:
+            if response_content.startswith(bom):
+                encoding = bom_encoding
+                logger.debug("[PROXY DEBUG] Encoding from BOM: {}", encoding)
+                break
+
+        # 2. Try to get charset from Content-Type header
+        if not encoding:
+            charset_match = _HEADER_CHARSET_RE.search(content_type)
+            if charset_match:
+                encoding = charset_match.group(1).lower()
+                logger.debug("[PROXY DEBUG] Encoding from Content-Type: {}", encoding)
+
+        # 3. Try to detect from HTML meta tags in the first 2048 bytes
+        if not encoding or encoding in _UNTRUSTED_ENCODINGS:
+            charset_match = _META_CHARSET_RE.search(response_content, 0, 2048)
+            if charset_match:
+                meta_encoding = charset_match.group(1).decode('ascii', errors='ignore').lower()
+                logger.debug("[PROXY DEBUG] Encoding from HTML meta: {}", meta_encoding)
+                if meta_encoding == 'utf-8':
+                    encoding = 'utf-8'
+
+        # 4. Nothing trustworthy declared - most pages are UTF-8, so try that before anything else
+        if not encoding or encoding in _UNTRUSTED_ENCODINGS:
+            # Pure-ASCII bodies are valid UTF-8; isascii() checks that without building a throwaway str
+            if response_content.isascii():
+                logger.debug("[PROXY DEBUG] Body is ASCII")
+                return response_content
+            try:
+                response_content.decode('utf-8')
+                logger.debug("[PROXY DEBUG] Body is valid UTF-8")
+                return response_content
+            except UnicodeDecodeError:
+                pass
+
+            # A declared encoding that isn't UTF-8 is still better than guessing
+            if not encoding:
+                encoding = self._detect_encoding(response_content, url)
+
+        # 5. Fallback to utf-8 if nothing detected
+        if not encoding:
+            encoding = 'utf-8'
+
+        logger.debug("[PROXY DEBUG] Final encoding to use: {} for {}", encoding, url)
+
+        # UTF-8 bodies pass straight through; any invalid bytes are replaced when the browser decodes them
+        try:
+            if codecs.lookup(encoding).name in _UTF8_CODECS:
+                return response_content
+        except LookupError:
+            logger.debug("[PROXY DEBUG] Unknown encoding {}, passing body through as UTF-8", encoding)
+            return response_content
+
+        # Transcode everything else to UTF-8
+        html_content = response_content.decode(encoding, errors='replace')
+        logger.opt(lazy=True).debug("[PROXY DEBUG] First 200 chars of decoded HTML: {}", lambda: html_content[:200])
+        return html_content.encode('utf-8')
+
+    def _detect_encoding(self, response_content: bytes, url: str) -> Optional[str]:
+        """
+        Guess the encoding of an undeclared, non-UTF-8 body
+
+        Pages from one site almost always share an encoding, so the result is
+        remembered per host and later pages from that host skip detection
+
+        Args:
+            response_content: The raw (already decompressed) response body
+            url: The page URL
+
+        Returns:
+            The detected encoding, or None if it couldn't be determined
+        """
+        host = urlsplit(url).hostname
+        encoding = self._host_encodings.get(host)
+        if encoding is not None:
+            logger.debug("[PROXY DEBUG] Encoding remembered for {}: {}", host, encoding)
+            return encoding
+
+        if detect_charset is None:
+            return None
+
+        encoding = _best_encoding(response_content[:DETECT_SAMPLE_BYTES])
+
+        # The body is known not to be ASCII, so an ASCII (or empty) verdict only means the
+        # sample held no non-ASCII bytes, e.g. a long plain head - look at the whole body instead
+        if encoding is None and len(response_content) > DETECT_SAMPLE_BYTES:
+            encoding = _best_encoding(response_content)
+
+        if encoding is None:
+            return None
+
+        logger.debug("[PROXY DEBUG] Encoding from charset-normalizer: {}", encoding)
+        self._host_encodings.set(host, encoding)
+        return encoding
+
+    async def _rewrite_urls(self, html: bytes, base_url: str) -> Optional[bytes]:
         """
         Rewrite relative and absolute URLs in HTML to absolute URLs
         This ensures resources load correctly in the iframe
 
+        Rewriting a large page is CPU-bound, so it runs in the parse worker
+        pool to keep the event loop free for other requests. If the pool is
+        unavailable the page is rewritten inline instead
+
         Args:
-            html: The HTML content
+            html: The HTML content as UTF-8 bytes
             base_url: The base URL of the page
 
         Returns:
-            Modified HTML with rewritten URLs
+            Modified HTML with rewritten URLs, or None if the page couldn't be rewritten
         """
+        pool = self._parse_pool
+        if pool is not None:
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(pool, rewrite_html, html, base_url)
+            except BrokenProcessPool:
+                # A worker died (OOM kill, crash) and took the pool with it - start a fresh one
+                logger.warning("HTML rewrite pool is broken, replacing it")
+                if self._parse_pool is pool:
+                    self._parse_pool = self._create_parse_pool()
+                    pool.shutdown(wait=False, cancel_futures=True)
+            except Exception as e:
+                logger.warning(f"Error rewriting URLs in worker: {str(e)}. Rewriting inline.")
+
         try:
-            soup = BeautifulSoup(html, 'lxml')
-
-            # Rewrite <a> tags
-            for tag in soup.find_all('a', href=True):
-                tag['href'] = urljoin(base_url, tag['href'])
-
-            # Rewrite <img> tags
-            for tag in soup.find_all('img', src=True):
-                tag['src'] = urljoin(base_url, tag['src'])
-
-            # Rewrite <link> tags (stylesheets, etc.)
-            for tag in soup.find_all('link', href=True):
-                tag['href'] = urljoin(base_url, tag['href'])
-
-            # Rewrite <script> tags
-            for tag in soup.find_all('script', src=True):
-                tag['src'] = urljoin(base_url, tag['src'])
-
-            # Rewrite <form> actions
-            for tag in soup.find_all('form', action=True):
-                tag['action'] = urljoin(base_url, tag['action'])
-
-            # Ensure proper charset meta tag exists in head
-            if soup.head:
-                # Check if charset meta tag exists
-                has_charset = False
-                for meta in soup.head.find_all('meta'):
-                    if meta.get('charset') or (meta.get('http-equiv', '').lower() == 'content-type'):
-                        has_charset = True
-                        break
-
-                # If no charset tag, add one at the very beginning
-                if not has_charset:
-                    charset_meta = soup.new_tag('meta', charset='utf-8')
-                    soup.head.insert(0, charset_meta)
-                    logger.debug("[PROXY] Added missing charset meta tag")
-
-                # Add base tag after charset
-                base_tag = soup.new_tag('base', href=base_url)
-                # Insert after charset meta if we just added it, otherwise at beginning
-                insert_index = 1 if not has_charset else 0
-                soup.head.insert(insert_index, base_tag)
-
-            # Return as string - str(soup) is more reliable than prettify()
-            # for encoding preservation
-            return str(soup)
+            return rewrite_html(html, base_url)
         except Exception as e:
             logger.warning(f"Error rewriting URLs: {str(e)}. Returning original HTML.")
-            return html
+            return None
 
     def _get_safe_headers(self, original_headers: dict) -> dict:
         """
@@ -251,80 +732,85 @@ class BrowserProxyService:
         Returns:
             Filtered headers safe for iframe display
         """
-        # Headers to remove for iframe compatibility and proper content display
-        unsafe_headers = {
-            'x-frame-options',
-            'content-security-policy',
-            'x-content-security-policy',
-            'x-webkit-csp',
-            # Strip content-encoding headers as httpx has already decompressed the content
-            # If we leave these, the browser will try to decompress already-decompressed content
-            'content-encoding',
-            'transfer-encoding',
-            # Also strip content-length as it may be incorrect after our modifications
-            'content-length',
-        }
-
-        safe_headers = {}
-        for key, value in original_headers.items():
-            if key.lower() not in unsafe_headers:
-                safe_headers[key] = value
+        safe_headers = {key: value for key, value in original_headers.items() if key.lower() not in _UNSAFE_HEADERS}
 
-        logger.debug(f"[PROXY DEBUG] Stripped headers: {[k for k in original_headers.keys() if k.lower() in unsafe_headers]}")
+        logger.opt(lazy=True).debug(
+            "[PROXY DEBUG] Stripped headers: {}",
+            lambda: [k for k in original_headers.keys() if k.lower() in _UNSAFE_HEADERS]
+        )
 
         return safe_headers
 
-    def _is_valid_url(self, url: str) -> bool:
+    async def _validate_url(self, url: str) -> Optional[str]:
         """
-        Check if URL is valid
+        Check that a URL is a valid http(s) URL that doesn't point at an internal host
+
+        The URL is parsed once for both checks
 
         Args:
             url: The URL to validate
 
         Returns:
-            True if valid, False otherwise
+            An error message if the URL must not be fetched, None otherwise
         """
+        # Quotes, angle brackets, whitespace and control characters are never valid
+        # unencoded in a URL, and would otherwise end up in rewritten attributes
+        if _INVALID_URL_CHARS_RE.search(url):
+            return "Invalid URL provided"
+
         try:
-            result = urlparse(url)
-            return all([result.scheme in ['http', 'https'], result.netloc])
-        except Exception:
-            return False
+            parsed = urlsplit(url)
+        except ValueError:
+            return "Invalid URL provided"
+
+        if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+            return "Invalid URL provided"
+
+        # Check for SSRF protection
+        if await self._is_internal_host(parsed.hostname):
+            return "Access to internal URLs is not allowed"
+
+        return None
 
-    def _is_internal_url(self, url: str) -> bool:
+    async def _is_internal_host(self, hostname: Optional[str]) -> bool:
         """
-        Check if URL points to internal/localhost addresses (SSRF protection)
+        Check if a hostname is or resolves to an internal address (SSRF protection)
 
         Args:
-            url: The URL to check
+            hostname: The hostname of the URL to check
 
         Returns:
-            True if internal URL, False otherwise
+            True if internal host, False otherwise
         """
-        try:
-            parsed = urlparse(url)
-            hostname = parsed.hostname
-
-            if not hostname:
-                return True
+        if not hostname:
+            return True
 
-            # Block localhost, 127.0.0.1, and private IP ranges
-            blocked_hosts = [
-                'localhost',
-                '127.0.0.1',
-                '0.0.0.0',
-                '::1',
-            ]
+        hostname = hostname.lower()
+        if hostname in _BLOCKED_HOSTS or hostname.endswith('.localhost'):
+            return True
 
-            if hostname.lower() in blocked_hosts:
-                return True
+        # Literal IP addresses are checked directly, without a DNS lookup
+        try:
+            return _is_internal_ip(ipaddress.ip_address(hostname))
+        except ValueError:
+            pass
 
-            # Block private IP ranges (simple check)
-            if hostname.startswith('10.') or hostname.startswith('192.168.') or hostname.startswith('172.'):
-                return True
+        cached = self._host_cache.get(hostname)
+        if cached is not None:
+            return cached
 
+        # Resolve the name so hosts that point at private addresses are caught too;
+        # this also normalizes hex/octal/short IPv4 forms like 0x7f.1
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(hostname, None, type=socket.SOCK_STREAM)
+        except socket.gaierror:
+            # Names only the upstream (RBC) proxy can resolve are left to it
+            logger.debug("Could not resolve {} for SSRF check", hostname)
             return False
-        except Exception:
-            return True  # Err on the side of caution
+
+        internal = any(_is_internal_ip(ipaddress.ip_address(info[4][0])) for info in infos)
+        self._host_cache.set(hostname, internal)
+        return internal
 
 # Global instance
 browser_proxy_service = BrowserProxyService()
@@ -0,0 +1,195 @@
+"""
+Shared response cache backed by Redis
+Caches rewritten proxy pages and scrape/search results across requests and workers
+"""
+
+import hashlib
+import struct
+import time
+import zlib
+from typing import Any, Optional
+
+import orjson
+from loguru import logger
+from app.config import config
+
+# redis is optional - without it (or without REDIS_URL) the cache is disabled
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:
+    redis_asyncio = None
+
+KEY_PREFIX = "alex-assist"
+
+# A cache lookup must never cost more than the work it saves: give up on Redis quickly,
+# and after a failure stop trying for a while instead of paying the timeout on every request
+REDIS_TIMEOUT_SECONDS = 0.5
+REDIS_RETRY_AFTER_SECONDS = 30
+
+# Blob entries: 4-byte big-endian length of the JSON metadata, the metadata, then the raw body
+_BLOB_HEADER = struct.Struct(">I")
+
+class ResponseCache:
+    """
+    Best-effort Redis cache for JSON-serializable results
+    Values are stored as zlib-compressed JSON (or raw bytes plus JSON metadata for blobs);
+    any Redis failure is logged and treated as a miss
+    """
+
+    def __init__(self):
+        self.ttl = config.cache_ttl_seconds
+        self._redis = None
+        self._retry_at = 0.0
+
+        self.enabled = bool(config.redis_url)
+        if self.enabled and redis_asyncio is None:
+            logger.warning("REDIS_URL is set but the redis package is not installed - response cache disabled")
+            self.enabled = False
+
+    @staticmethod
+    def make_key(namespace: str, *parts: Any) -> str:
+        """
+        Build a compact cache key from a namespace and the request options
+
+        Args:
+            namespace: The kind of result (e.g. "proxy", "scrape", "search")
+            parts: Values that identify the request (URL, query, flags, ...)
+
+        Returns:
+            Cache key string
+        """
+        raw = "|".join(str(part) for part in parts).encode("utf-8")
+        digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        return f"{KEY_PREFIX}:{namespace}:{digest}"
+
+    def _get_client(self):
+        """Create the Redis client on first use"""
+        if self._redis is None:
+            self._redis = redis_asyncio.from_url(
+                config.redis_url,
+                socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+                socket_timeout=REDIS_TIMEOUT_SECONDS,
+            )
+        return self._redis
+
+    def _available(self) -> bool:
+        """Whether the cache is enabled and not backing off after a Redis failure"""
+        return self.enabled and time.monotonic() >= self._retry_at
+
+    def _mark_failed(self, action: str, key: str, error: Exception) -> None:
+        """Log a Redis failure and skip the cache for REDIS_RETRY_AFTER_SECONDS"""
+        self._retry_at = time.monotonic() + REDIS_RETRY_AFTER_SECONDS
+        logger.warning(
+            f"Response cache {action} failed for {key}: {error} - bypassing cache for {REDIS_RETRY_AFTER_SECONDS}s"
+        )
+
+    async def _read(self, key: str) -> Optional[bytes]:
+        """Fetch a raw payload from Redis, backing off if Redis is unreachable"""
+        if not self._available():
+            return None
+
+        try:
+            return await self._get_client().get(key)
+        except Exception as e:
+            self._mark_failed("read", key, e)
+            return None
+
+    async def _write(self, key: str, payload: bytes, ttl: Optional[int]) -> None:
+        """Store a raw payload in Redis, backing off if Redis is unreachable"""
+        try:
+            await self._get_client().setex(key, ttl or self.ttl, payload)
+        except Exception as e:
+            self._mark_failed("write", key, e)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        payload = await self._read(key)
+        if payload is None:
+            return None
+
+        try:
+            return orjson.loads(zlib.decompress(payload))
+        except Exception as e:
+            logger.warning(f"Response cache entry {key} is unreadable: {e}")
+            return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """
+        Store a value
+
+        Args:
+            key: Key from make_key()
+            value: JSON-serializable value
+            ttl: Expiry in seconds (defaults to CACHE_TTL_SECONDS)
+        """
+        if not self._available():
+            return
+
+        try:
+            payload = zlib.compress(orjson.dumps(value))
+        except Exception as e:
+            logger.warning(f"Response cache value for {key} can't be serialized: {e}")
+            return
+        await self._write(key, payload, ttl)
+
+    async def get_blob(self, key: str) -> Optional[tuple[bytes, Any]]:
+        """
+        Look up a cached binary body and its metadata
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Tuple of (body, metadata), or None on a miss
+        """
+        payload = await self._read(key)
+        if payload is None:
+            return None
+
+        try:
+            data = zlib.decompress(payload)
+            (meta_len,) = _BLOB_HEADER.unpack_from(data)
+            meta_end = _BLOB_HEADER.size + meta_len
+            return data[meta_end:], orjson.loads(data[_BLOB_HEADER.size:meta_end])
+        except Exception as e:
+            logger.warning(f"Response cache entry {key} is unreadable: {e}")
+            return None
+
+    async def set_blob(self, key: str, body: bytes, meta: Any, ttl: Optional[int] = None) -> None:
+        """
+        Store a binary body as-is alongside JSON-serializable metadata
+
+        Args:
+            key: Key from make_key()
+            body: Raw bytes (e.g. a rewritten page)
+            meta: JSON-serializable metadata (e.g. response headers)
+            ttl: Expiry in seconds (defaults to CACHE_TTL_SECONDS)
+        """
+        if not self._available():
+            return
+
+        try:
+            meta_json = orjson.dumps(meta)
+        except Exception as e:
+            logger.warning(f"Response cache metadata for {key} can't be serialized: {e}")
+            return
+        payload = zlib.compress(_BLOB_HEADER.pack(len(meta_json)) + meta_json + body)
+        await self._write(key, payload, ttl)
+
+    async def aclose(self) -> None:
+        """Close the Redis connection pool"""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+        self._retry_at = 0.0
+
+# Global instance
+response_cache = ResponseCache()
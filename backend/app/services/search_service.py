@@ -4,8 +4,12 @@ Search service using DuckDuckGo
 
 from duckduckgo_search import DDGS
 from typing import List, Dict, Any, Optional
+import asyncio
 import logging
 
+from app.services.cache import response_cache
+from app.utils.single_flight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 class SearchService:
@@ -16,11 +20,15 @@ class SearchService:
     def __init__(self):
         self.ddgs = DDGS()
 
+        # Searches currently in progress, so identical concurrent queries share one upstream call
+        self._inflight = SingleFlight()
+
     async def search(
         self,
         query: str,
         max_results: int = 10,
         region: str = "wt-wt",  # Worldwide
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
         """
         Perform a web search using DuckDuckGo
@@ -29,34 +37,61 @@ class SearchService:
             query: The search query string
             max_results: Maximum number of results to return
             region: Region code for localized results
+            use_cache: Whether a cached result may be returned
+
+        Returns:
+            Dictionary containing search results
+        """
+        cache_key = response_cache.make_key("search", query, max_results, region)
+        if use_cache:
+            cached = await response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        return await self._inflight.do(
+            cache_key, lambda: self._run_search(query, max_results, region, cache_key)
+        )
+
+    async def _run_search(self, query: str, max_results: int, region: str, cache_key: str) -> Dict[str, Any]:
+        """
+        Run a web search against DuckDuckGo and cache a successful result
+
+        Args:
+            query: The search query string
+            max_results: Maximum number of results to return
+            region: Region code for localized results
+            cache_key: Shared cache key for the result
 
         Returns:
             Dictionary containing search results
         """
         try:
-            # Perform the search
-            results = list(self.ddgs.text(
+            # DDGS is synchronous, so run it in a worker thread to keep the event loop free
+            results = await asyncio.to_thread(lambda: list(self.ddgs.text(
                 keywords=query,
                 region=region,
                 max_results=max_results,
-            ))
+            )))
 
             # Format results
-            formatted_results = []
-            for idx, result in enumerate(results):
-                formatted_results.append({
+            formatted_results = [
+                {
                     "index": idx,
                     "title": result.get("title", ""),
                     "url": result.get("href", result.get("link", "")),
                     "snippet": result.get("body", result.get("description", "")),
-                })
+                }
+                for idx, result in enumerate(results)
+            ]
 
-            return {
+            response = {
                 "success": True,
                 "query": query,
                 "results": formatted_results,
                 "count": len(formatted_results),
             }
+            await response_cache.set(cache_key, response)
+            return response
 
         except Exception as e:
             logger.error(f"Error performing search for '{query}': {str(e)}")
@@ -72,6 +107,7 @@ class SearchService:
         self,
         query: str,
         max_results: int = 10,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
         """
         Search for news articles
@@ -79,33 +115,59 @@ class SearchService:
         Args:
             query: The search query
             max_results: Maximum number of results
+            use_cache: Whether a cached result may be returned
+
+        Returns:
+            Dictionary containing news results
+        """
+        cache_key = response_cache.make_key("news", query, max_results)
+        if use_cache:
+            cached = await response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        return await self._inflight.do(
+            cache_key, lambda: self._run_news_search(query, max_results, cache_key)
+        )
+
+    async def _run_news_search(self, query: str, max_results: int, cache_key: str) -> Dict[str, Any]:
+        """
+        Run a news search against DuckDuckGo and cache a successful result
+
+        Args:
+            query: The search query
+            max_results: Maximum number of results
+            cache_key: Shared cache key for the result
 
         Returns:
             Dictionary containing news results
         """
         try:
-            results = list(self.ddgs.news(
+            results = await asyncio.to_thread(lambda: list(self.ddgs.news(
                 keywords=query,
                 max_results=max_results,
-            ))
+            )))
 
-            formatted_results = []
-            for idx, result in enumerate(results):
-                formatted_results.append({
+            formatted_results = [
+                {
                     "index": idx,
                     "title": result.get("title", ""),
                     "url": result.get("url", ""),
                     "snippet": result.get("body", ""),
                     "source": result.get("source", ""),
                     "date": result.get("date", ""),
-                })
+                }
+                for idx, result in enumerate(results)
+            ]
 
-            return {
+            response = {
                 "success": True,
                 "query": query,
                 "results": formatted_results,
                 "count": len(formatted_results),
             }
+            await response_cache.set(cache_key, response)
+            return response
 
         except Exception as e:
             logger.error(f"Error performing news search for '{query}': {str(e)}")
@@ -7,10 +7,42 @@ from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
 from crawl4ai.extraction_strategy import LLMExtractionStrategy
 from typing import Optional, Dict, Any, List
 from datetime import datetime
+import asyncio
 import logging
 
+from app.services.cache import response_cache
+
 logger = logging.getLogger(__name__)
 
+# Default number of pages scrape_multiple_urls loads at the same time
+SCRAPE_CONCURRENCY = 8
+
+# Run configs are read-only per crawl, so the two variants are built once and shared by every scrape
+_MARKDOWN_RUN_CONFIG = CrawlerRunConfig(
+    cache_mode=CacheMode.ENABLED,
+    markdown_generator=DefaultMarkdownGenerator(),
+)
+_HTML_RUN_CONFIG = CrawlerRunConfig(
+    cache_mode=CacheMode.ENABLED,
+    markdown_generator=None,
+)
+
+# Playwright error text meaning the browser behind the crawler crashed or disconnected
+_BROWSER_GONE_MARKERS = (
+    'has been closed',
+    'browser closed',
+    'target closed',
+    'connection closed',
+    'browser has disconnected',
+)
+
+
+def _is_browser_gone(message: Optional[str]) -> bool:
+    """Return True if a crawl error says the headless browser is no longer usable"""
+    message = (message or "").lower()
+    return any(marker in message for marker in _BROWSER_GONE_MARKERS)
+
+
 class WebScraperService:
     """
     Service for scraping web pages using crawl4ai
@@ -23,11 +55,60 @@ class WebScraperService:
             verbose=False,
         )
 
+        # Shared crawler (and its headless browser), started on first use and closed in aclose()
+        self._crawler: Optional[AsyncWebCrawler] = None
+        self._crawler_lock = asyncio.Lock()
+
+    async def _get_crawler(self) -> AsyncWebCrawler:
+        """
+        Return the shared crawler, starting its browser on first use
+
+        Launching the browser takes far longer than most page loads, so one
+        instance serves every scrape instead of one being started per URL
+
+        Returns:
+            The started AsyncWebCrawler
+        """
+        if self._crawler is None:
+            # Concurrent first scrapes must not each launch a browser
+            async with self._crawler_lock:
+                if self._crawler is None:
+                    crawler = AsyncWebCrawler(config=self.browser_config)
+                    await crawler.start()
+                    self._crawler = crawler
+        return self._crawler
+
+    async def _reset_crawler(self, crawler: AsyncWebCrawler) -> None:
+        """
+        Drop a crawler whose browser has died so the next scrape launches a new one
+
+        Args:
+            crawler: The crawler the failed scrape ran on
+        """
+        async with self._crawler_lock:
+            # A concurrent failure may already have replaced it
+            if self._crawler is not crawler:
+                return
+            self._crawler = None
+
+        logger.warning("Headless browser is gone, restarting it on the next scrape")
+        try:
+            await crawler.close()
+        except Exception as e:
+            logger.debug(f"Error closing dead crawler: {e}")
+
+    async def aclose(self) -> None:
+        """Close the shared crawler and its browser"""
+        if self._crawler is not None:
+            await self._crawler.close()
+            self._crawler = None
+
     async def scrape_url(
         self,
         url: str,
         include_links: bool = True,
         format_markdown: bool = True,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
         """
         Scrape a URL and extract its content
@@ -36,68 +117,79 @@ class WebScraperService:
             url: The URL to scrape
             include_links: Whether to extract links from the page
             format_markdown: Whether to convert content to markdown
+            use_cache: Whether a cached result may be returned
 
         Returns:
             Dictionary containing scraped content and metadata
         """
+        cache_key = response_cache.make_key("scrape", url, include_links, format_markdown)
+        if use_cache:
+            cached = await response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        crawler = None
         try:
-            async with AsyncWebCrawler(config=self.browser_config) as crawler:
-                crawler_config = CrawlerRunConfig(
-                    cache_mode=CacheMode.ENABLED,
-                    markdown_generator=DefaultMarkdownGenerator() if format_markdown else None,
-                )
-
-                result = await crawler.arun(
-                    url=url,
-                    config=crawler_config,
-                )
-
-                if not result.success:
-                    logger.error(f"Failed to scrape {url}: {result.error_message}")
-                    return {
-                        "success": False,
-                        "error": result.error_message or "Unknown error occurred",
-                        "url": url,
-                    }
+            crawler = await self._get_crawler()
+            crawler_config = _MARKDOWN_RUN_CONFIG if format_markdown else _HTML_RUN_CONFIG
+
+            result = await crawler.arun(
+                url=url,
+                config=crawler_config,
+            )
+
+            if not result.success:
+                logger.error(f"Failed to scrape {url}: {result.error_message}")
+                if _is_browser_gone(result.error_message):
+                    await self._reset_crawler(crawler)
+                return {
+                    "success": False,
+                    "error": result.error_message or "Unknown error occurred",
+                    "url": url,
+                }
 
-                # Extract links if requested
-                links = []
-                if include_links and result.links:
-                    links = [
-                        {
-                            "text": link.get("text", ""),
-                            "url": link.get("href", ""),
-                        }
-                        for link in result.links.get("internal", [])[:20]  # Limit to first 20 internal links
-                    ]
-
-                # Get metadata
-                metadata = {}
-                if hasattr(result, 'metadata') and result.metadata:
-                    metadata = {
-                        "title": result.metadata.get("title", ""),
-                        "description": result.metadata.get("description", ""),
-                        "keywords": result.metadata.get("keywords", ""),
-                        "author": result.metadata.get("author", ""),
-                        "og_title": result.metadata.get("og:title", ""),
-                        "og_description": result.metadata.get("og:description", ""),
+            # Extract links if requested
+            links = []
+            if include_links and result.links:
+                links = [
+                    {
+                        "text": link.get("text", ""),
+                        "url": link.get("href", ""),
                     }
+                    for link in result.links.get("internal", [])[:20]  # Limit to first 20 internal links
+                ]
+
+            # Get metadata
+            metadata = {}
+            if hasattr(result, 'metadata') and result.metadata:
+                metadata = {
+                    "title": result.metadata.get("title", ""),
+                    "description": result.metadata.get("description", ""),
+                    "keywords": result.metadata.get("keywords", ""),
+                    "author": result.metadata.get("author", ""),
+                    "og_title": result.metadata.get("og:title", ""),
+                    "og_description": result.metadata.get("og:description", ""),
+                }
 
-                # Get content (markdown if requested, otherwise HTML)
-                content = result.markdown if format_markdown else result.html
+            # Get content (markdown if requested, otherwise HTML)
+            content = result.markdown if format_markdown else result.html
 
-                return {
-                    "success": True,
-                    "url": url,
-                    "title": metadata.get("title", ""),
-                    "content": content[:50000],  # Limit content size for LLM
-                    "links": links,
-                    "metadata": metadata,
-                    "scraped_at": datetime.utcnow().isoformat(),
-                }
+            scraped = {
+                "success": True,
+                "url": url,
+                "title": metadata.get("title", ""),
+                "content": content[:50000],  # Limit content size for LLM
+                "links": links,
+                "metadata": metadata,
+                "scraped_at": datetime.utcnow().isoformat(),
+            }
+            await response_cache.set(cache_key, scraped)
+            return scraped
 
         except Exception as e:
             logger.error(f"Error scraping URL {url}: {str(e)}")
+            if crawler is not None and _is_browser_gone(str(e)):
+                await self._reset_crawler(crawler)
             return {
                 "success": False,
                 "error": str(e),
@@ -109,6 +201,7 @@ class WebScraperService:
         urls: List[str],
         include_links: bool = True,
         format_markdown: bool = True,
+        concurrency: int = SCRAPE_CONCURRENCY,
     ) -> List[Dict[str, Any]]:
         """
         Scrape multiple URLs concurrently
@@ -117,16 +210,29 @@ class WebScraperService:
             urls: List of URLs to scrape
             include_links: Whether to extract links
             format_markdown: Whether to convert to markdown
+            concurrency: Maximum number of pages loaded at the same time
 
         Returns:
-            List of scrape results
+            List of scrape results, in the same order as urls
         """
-        results = []
-        for url in urls:
-            result = await self.scrape_url(url, include_links, format_markdown)
-            results.append(result)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _scrape_one(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.scrape_url(url, include_links, format_markdown)
+
+        results = await asyncio.gather(*(_scrape_one(url) for url in urls), return_exceptions=True)
+
+        # return_exceptions also swallows cancellation; if this task is being cancelled, propagate it
+        # instead of reporting every URL as a failed scrape
+        if asyncio.current_task().cancelling():
+            raise asyncio.CancelledError()
 
-        return results
+        return [
+            {"success": False, "error": str(result) or type(result).__name__, "url": url}
+            if isinstance(result, BaseException) else result
+            for url, result in zip(urls, results)
+        ]
 
     async def extract_main_content(self, url: str) -> Optional[str]:
         """
@@ -0,0 +1,140 @@
+"""HTML link rewriting for proxied pages.
+Kept free of app config and services so it can run inside worker processes.
+"""
+
+import html as html_lib
+import re
+
+from urllib.parse import urljoin, urlsplit
+
+# Links that resolve the same with or without the page URL, so urljoin is skipped for them
+_UNCHANGED_LINK_PREFIXES = (b'http://', b'https://', b'#', b'mailto:', b'javascript:', b'data:', b'tel:')
+
+# URL attribute of a link-bearing tag; the value is double-quoted, single-quoted or bare
+_LINK_ATTR = (
+    rb'''(<(?:a|area|img|link|script|form|iframe|frame|embed|source|track|video|audio|input)\b[^>]*?\s(?:href|src|action)\s*=\s*)'''
+    rb'''(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))'''
+)
+_LINK_ATTR_RE = re.compile(_LINK_ATTR, re.IGNORECASE)
+
+# Markup scanned for links: comments and <script>/<style> elements are matched first so
+# their contents are left alone (markup inside script strings is built at runtime);
+# only the opening tag of such an element is rewritten
+_MARKUP_RE = re.compile(
+    rb'(<!--.*?-->)'
+    rb'|(<(script|style)\b[^>]*>)(.*?</\3\s*>)'
+    rb'|' + _LINK_ATTR,
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Characters that would end or break out of an attribute value, and their references
+_ATTR_SPECIAL_RE = re.compile(rb'''["'<>]''')
+_ATTR_ESCAPES = {b'"': b'&quot;', b"'": b'&#x27;', b'<': b'&lt;', b'>': b'&gt;'}
+
+# The page's own <base href>, split into (prefix, quote, value)
+_BASE_HREF_RE = re.compile(rb'''(<base\b[^>]*?\shref\s*=\s*)(["']?)([^"'\s>]*)\2''', re.IGNORECASE)
+
+# Opening <head> tag, where the <base> and charset tags are injected
+_HEAD_RE = re.compile(rb'<head\b[^>]*>', re.IGNORECASE)
+
+# Opening <html> tag, the injection point for pages that omit <head>
+_HTML_RE = re.compile(rb'<html\b[^>]*>', re.IGNORECASE)
+
+# BOM, whitespace and doctype at the start of a page with neither tag; injected tags go after
+# them so the doctype stays first and the page isn't switched into quirks mode
+_PROLOGUE_RE = re.compile(rb'(?:\xef\xbb\xbf)?\s*(?:<!doctype\b[^>]*>)?', re.IGNORECASE)
+
+# An existing charset declaration (<meta charset> or <meta http-equiv="Content-Type">)
+_META_CHARSET_RE = re.compile(
+    rb'''<meta\b[^>]*?(?:\scharset\s*=|\shttp-equiv\s*=\s*["']?content-type)''',
+    re.IGNORECASE,
+)
+
+
+def _escape_attr(value: bytes) -> bytes:
+    """Escape quotes and angle brackets so value can't break out of an attribute.
+
+    Ampersands are left alone: the page's own part of a link is already
+    HTML-encoded, and re-escaping it would change the URL.
+    """
+    return _ATTR_SPECIAL_RE.sub(lambda match: _ATTR_ESCAPES[match.group()], value)
+
+
+def _make_absolute(link: bytes, base_url: str, scheme: bytes, origin: bytes) -> bytes:
+    """Resolve a link against the page URL, leaving links that are already absolute alone.
+
+    scheme and origin come from the page URL, split and attribute-escaped once
+    per page, so the common protocol-relative and root-relative links are joined
+    without re-parsing it.
+    """
+    if link.startswith(_UNCHANGED_LINK_PREFIXES):
+        return link
+    if link.startswith(b'//'):
+        return scheme + b':' + link
+    if link.startswith(b'/') and b'/.' not in link:
+        return origin + link
+    # urljoin only accepts ASCII bytes; round-trip any other bytes unchanged
+    joined = urljoin(base_url, link.decode('utf-8', 'surrogateescape'))
+    return _escape_attr(joined.encode('utf-8', 'surrogateescape'))
+
+
+def rewrite_html(html: bytes, base_url: str) -> bytes:
+    """Make every link in the page absolute and add <base> and charset tags to its head.
+
+    Works as a single regex pass over the UTF-8 markup rather than building and
+    serializing a DOM; the injected <base> tag covers any relative URL the
+    pass doesn't touch (srcset, inline CSS, scripts).
+    """
+    page_base = _BASE_HREF_RE.search(html)
+    if page_base is not None:
+        # The page sets its own base URL, which the browser resolves every relative
+        # link against - making that one URL absolute is enough
+        prefix, quote, href = page_base.groups()
+        quote = quote or b'"'
+        page_href = html_lib.unescape(href.decode('utf-8', 'replace'))
+        absolute = html_lib.escape(urljoin(base_url, page_href), quote=True).encode('utf-8')
+        html = b''.join((html[:page_base.start()], prefix, quote, absolute, quote, html[page_base.end():]))
+        head_tags = b''
+    else:
+        base = urlsplit(base_url)
+        # The page URL comes from the request, so its parts are escaped before going into attributes
+        scheme = _escape_attr(base.scheme.encode('utf-8'))
+        origin = _escape_attr(f"{base.scheme}://{base.netloc}".encode('utf-8'))
+
+        # Pages repeat the same links (icons, sprites, shared scripts), so each is resolved once
+        resolved: dict[bytes, bytes] = {}
+
+        def _absolute(link: bytes) -> bytes:
+            absolute = resolved.get(link)
+            if absolute is None:
+                absolute = resolved[link] = _make_absolute(link, base_url, scheme, origin)
+            return absolute
+
+        def _link(prefix: bytes, double: bytes, single: bytes, bare: bytes) -> bytes:
+            if double is not None:
+                return b''.join((prefix, b'"', _absolute(double), b'"'))
+            if single is not None:
+                return b''.join((prefix, b"'", _absolute(single), b"'"))
+            return prefix + _absolute(bare)
+
+        def _rewrite(match: re.Match) -> bytes:
+            comment, raw_open, _, raw_rest, prefix, double, single, bare = match.groups()
+            if comment is not None:
+                return comment
+            if raw_open is not None:
+                return _LINK_ATTR_RE.sub(lambda attr: _link(*attr.groups()), raw_open) + raw_rest
+            return _link(prefix, double, single, bare)
+
+        # Make link, image, script and form URLs absolute in one pass over the markup
+        html = _MARKUP_RE.sub(_rewrite, html)
+        head_tags = b'<base href="' + html_lib.escape(base_url, quote=True).encode('utf-8') + b'">'
+
+    # <head> is optional in HTML5; without it the tags go right after <html>, or
+    # failing that at the start of the document, where the parser opens the head itself
+    head = _HEAD_RE.search(html) or _HTML_RE.search(html) or _PROLOGUE_RE.match(html)
+
+    # If no charset tag, add one at the very beginning of the head
+    if _META_CHARSET_RE.search(html) is None:
+        head_tags = b'<meta charset="utf-8">' + head_tags
+
+    return b''.join((html[:head.end()], head_tags, html[head.end():]))
@@ -3,12 +3,18 @@ Switches between local OpenAI and RBC OAuth2 + custom endpoint.
 """
 
 from typing import Optional
-from openai import OpenAI, AsyncOpenAI
+import httpx
+from openai import OpenAI, AsyncOpenAI, DefaultAsyncHttpxClient
 from loguru import logger
 
 from app.config import config
 from app.utils.oauth_manager import OAuthManager
 
+# Connection pool of the async LLM client; idle connections stay open between chat requests
+LLM_MAX_CONNECTIONS = 64
+LLM_MAX_KEEPALIVE_CONNECTIONS = 32
+LLM_KEEPALIVE_EXPIRY_SECONDS = 30.0
+
 
 class LLMClientManager:
     """Manages LLM client instances with environment-specific setup."""
@@ -25,6 +31,17 @@ class LLMClientManager:
         else:
             self._setup_local_environment()
 
+    def _create_async_http_client(self) -> httpx.AsyncClient:
+        """Build the pooled HTTP client the async LLM client sends requests over."""
+        # DefaultAsyncHttpxClient keeps the SDK's own timeout and redirect defaults
+        return DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=LLM_KEEPALIVE_EXPIRY_SECONDS,
+            )
+        )
+
     def _setup_local_environment(self):
         """Setup for local development with OpenAI API."""
         logger.info("🏠 Setting up LOCAL environment")
@@ -39,7 +56,8 @@ class LLMClientManager:
 
         self._async_client = AsyncOpenAI(
             api_key=self.config.openai_api_key,
-            base_url=self.config.openai_base_url
+            base_url=self.config.openai_base_url,
+            http_client=self._create_async_http_client()
         )
 
         logger.info("✓ Local OpenAI client initialized")
@@ -88,7 +106,8 @@ class LLMClientManager:
 
         self._async_client = AsyncOpenAI(
             api_key=token,
-            base_url=self.config.rbc_llm_endpoint
+            base_url=self.config.rbc_llm_endpoint,
+            http_client=self._create_async_http_client()
         )
 
         logger.info("✓ RBC LLM client initialized")
@@ -115,6 +134,13 @@ class LLMClientManager:
 
         return self._async_client
 
+    async def aclose(self) -> None:
+        """Close the LLM clients and their connection pools."""
+        if self._async_client is not None:
+            await self._async_client.close()
+        if self._client is not None:
+            self._client.close()
+
     def get_default_model(self) -> str:
         """Get the default model for the current environment."""
         return self.config.default_model
@@ -33,12 +33,31 @@ class OAuthManager:
 
     def get_token(self) -> Optional[str]:
         """Get a valid access token (refreshes if needed)."""
-        with self._lock:
+        # Fast path: a current token is returned without taking the lock
+        token = self._access_token
+        if token and not self._needs_refresh():
+            return token
+
+        if token and not self._is_expired():
+            # Due for refresh but still valid - if another thread is already refreshing,
+            # keep using this token rather than waiting on the token endpoint
+            if not self._lock.acquire(blocking=False):
+                return token
+        else:
+            self._lock.acquire()
+
+        try:
             # Check if we need to refresh
             if not self._access_token or self._needs_refresh():
                 self._fetch_token()
 
             return self._access_token
+        finally:
+            self._lock.release()
+
+    def _is_expired(self) -> bool:
+        """Check if token has actually expired."""
+        return not self._expires_at or self._expires_at <= time.time()
 
     def _needs_refresh(self) -> bool:
         """Check if token needs to be refreshed."""
@@ -0,0 +1,30 @@
+"""Coalesces concurrent identical async calls into a single execution.
+Used by services so that a burst of requests for the same upstream resource
+triggers only one fetch.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time and shares its result with every caller."""
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Await func() for key, or join the call already in flight for that key."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shield the shared task so one caller disconnecting doesn't cancel it for the rest
+        return await asyncio.shield(task)
+
+    def __len__(self) -> int:
+        return len(self._inflight)
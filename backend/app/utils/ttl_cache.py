@@ -0,0 +1,80 @@
+"""Small in-process LRU cache with per-entry expiry.
+Used by services to memoize upstream results for a limited time.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """Bounded LRU mapping whose entries expire after a time-to-live.
+
+    Bounded by entry count, and optionally also by total size as measured by
+    sizeof (e.g. bytes of cached page bodies).
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: float = 3600.0,
+        maxbytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self._sizeof = sizeof
+        self._bytes = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any, int]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key, evicting least recently used entries to stay within the bounds."""
+        size = self._sizeof(value) if self._sizeof is not None and self.maxbytes is not None else 0
+        self._remove(key)
+
+        # A value larger than the whole budget would just evict everything else
+        if self.maxbytes is not None and size > self.maxbytes:
+            return
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value, size)
+        self._bytes += size
+
+        while len(self._data) > self.maxsize or (self.maxbytes is not None and self._bytes > self.maxbytes):
+            _, (_, _, evicted_size) = self._data.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value (expired or not), or default."""
+        entry = self._remove(key)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+        self._bytes = 0
+
+    def _remove(self, key: Hashable) -> Optional[tuple[float, Any, int]]:
+        """Remove key if present, keeping the size total in step."""
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,8 @@
+import os
+import sys
+from pathlib import Path
+
+# app.config refuses to load without credentials; tests never reach a real LLM endpoint
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,55 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.browser_proxy import BrowserProxyService
+
+PAGE = b'<html><head></head><body><a href="/next">next</a></body></html>'
+
+
+def _service(cache_control: str) -> tuple[BrowserProxyService, list]:
+    """A proxy service whose upstream serves PAGE with an ETag and the given Cache-Control"""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        headers = {"Content-Type": "text/html; charset=utf-8", "ETag": '"v1"', "Cache-Control": cache_control}
+        return httpx.Response(200, content=PAGE, headers=headers)
+
+    service = BrowserProxyService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def allow_all(url):
+        return None
+
+    service._validate_url = allow_all
+    return service, requests
+
+
+@pytest.mark.parametrize("cache_control", ["no-store", "private, max-age=600", "private"])
+def test_unstorable_pages_are_not_kept_for_revalidation(cache_control):
+    service, requests = _service(cache_control)
+    url = "http://example.test/account"
+
+    html, error, _ = asyncio.run(service.fetch_page(url))
+    assert error is None
+    assert b'href="http://example.test/next"' in html
+
+    assert service._validated_pages.get(url) is None
+    assert service._page_cache.get(url) is None
+
+    asyncio.run(service.fetch_page(url))
+    assert len(requests) == 2
+    assert "If-None-Match" not in requests[1].headers
+
+
+def test_no_cache_pages_are_revalidated():
+    service, requests = _service("no-cache")
+    url = "http://example.test/news"
+
+    asyncio.run(service.fetch_page(url))
+    assert service._validated_pages.get(url) is not None
+
+    asyncio.run(service.fetch_page(url))
+    assert requests[1].headers["If-None-Match"] == '"v1"'